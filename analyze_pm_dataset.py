@@ -3,11 +3,114 @@
 Quick Analysis and Validation of the 2023 PM Dataset
 """
 
+import os
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# Low-cardinality string columns stored as categoricals after load
+CATEGORICAL_COLUMNS = ['station_name', 'city', 'state', 'region', 'parameter', 'season']
+
+# WHO 2021 guideline limits in µg/m³
+WHO_LIMITS = {'PM2.5': 15, 'PM10': 45}
+
+# Columns of the ML-ready dataset read by validate_for_ml_project()
+ML_VALIDATION_COLUMNS = ['station_name', 'city', 'latitude', 'longitude', 'datetime']
+# Coordinates stay float64: float32 shifts the printed 3-decimal positions
+ML_VALIDATION_DTYPES = {'station_name': 'category', 'city': 'category'}
+
+def parquet_path_for(path):
+    """
+    Path of the Parquet cache kept next to a CSV dataset
+    
+    Named apart from the <name>.parquet copy the generator writes itself,
+    whose dtypes differ from the ones this script loads.
+    """
+    return os.path.splitext(path)[0] + '.analysis.parquet'
+
+def fresh_parquet_path(path):
+    """Parquet cache path of a CSV, or None when the cache is missing or older than the CSV"""
+    parquet_path = parquet_path_for(path)
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+            return parquet_path
+    except OSError:
+        pass  # No cache yet
+    return None
+
+def load_dataset(path, parse_dates, columns=None, dtype=None):
+    """
+    Load a dataset, preferring its Parquet copy over the CSV
+    
+    The first full load of a CSV materializes a Parquet file next to it
+    (zstd, dictionary-encoded strings) so later runs skip text parsing.
+    A cache older than the CSV is stale and is rebuilt by the next full
+    load. Column-subset loads without a fresh cache only parse those
+    columns of the CSV.
+    
+    Args:
+        path (str): CSV path of the dataset
+        parse_dates (list): Timestamp columns to parse when reading the CSV
+        columns (list, optional): Only load these columns
+        dtype (dict, optional): Column dtypes to use when reading the CSV
+        
+    Returns:
+        pd.DataFrame: Dataset with compact dtypes
+    """
+    parquet_path = fresh_parquet_path(path)
+    if parquet_path is not None:
+        return pd.read_parquet(parquet_path, columns=columns)
+    
+    df = pd.read_csv(path, engine='pyarrow', dtype_backend='pyarrow', parse_dates=parse_dates,
+                     usecols=columns, dtype=dtype)
+    
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'value' in df.columns:
+        df['value'] = df['value'].astype('float32')
+    
+    if columns is None:
+        df.to_parquet(parquet_path_for(path), compression='zstd', use_dictionary=True, index=False)
+    
+    return df
+
+def dataset_columns(path):
+    """Column names of a dataset, from the Parquet cache schema or CSV header without loading any data"""
+    parquet_path = fresh_parquet_path(path)
+    if parquet_path is not None:
+        return pq.read_schema(parquet_path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def group_mean(df, keys):
+    """Mean of `value` per observed group"""
+    return df.groupby(keys, observed=True)['value'].mean()
+
+def counts_by_appearance(column):
+    """
+    Row count per value, largest first, with ties in first-appearance order
+    
+    value_counts() on a categorical breaks ties in category (alphabetical)
+    order; counting groups in appearance order with a stable sort keeps the
+    order the plain string column gave.
+    """
+    return column.groupby(column, observed=True, sort=False).size().sort_values(ascending=False, kind='stable')
+
+def fast_quantiles(vals, qs):
+    """
+    Linearly interpolated quantiles from a single O(N) partial sort
+    
+    Gives the same result as np.percentile(..., method='linear') but only
+    selects the order statistics it needs with np.partition instead of
+    sorting the whole array.
+    """
+    positions = np.asarray(qs, dtype=np.float64) * (len(vals) - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(vals) - 1)
+    
+    selected = np.partition(vals, np.union1d(lower, upper))
+    return selected[lower] + (selected[upper] - selected[lower]) * (positions - lower)
 
 def analyze_pm_dataset():
     """Analyze the generated PM dataset"""
@@ -16,7 +119,7 @@ def analyze_pm_dataset():
     print("=" * 70)
     
     # Load the main dataset
-    df = pd.read_csv('india_pm_data_2023_complete_20250703_2126.csv')
+    df = load_dataset('india_pm_data_2023_complete_20250703_2126.csv', parse_dates=['date', 'datetime'])
     
     print(f"📊 Dataset Overview:")
     print(f"   • Shape: {df.shape}")
@@ -40,71 +143,87 @@ def analyze_pm_dataset():
     
     # Parameter distribution
     print(f"\n📈 Parameter Distribution:")
-    param_counts = df['parameter'].value_counts()
+    param_counts = counts_by_appearance(df['parameter'])
     for param, count in param_counts.items():
         print(f"   • {param}: {count:,} records ({count/len(df)*100:.1f}%)")
     
     # Station coverage
     print(f"\n🗺️ Geographic Coverage:")
-    print(f"   • Total stations: {df['station_name'].nunique()}")
-    print(f"   • Total cities: {df['city'].nunique()}")
-    print(f"   • Total states: {df['state'].nunique()}")
-    print(f"   • Total regions: {df['region'].nunique()}")
+    # These columns are categoricals built from the full column, so each
+    # distinct count is just the size of its category table
+    coverage = {col: len(df[col].cat.categories) for col in ['station_name', 'city', 'state', 'region']}
+    print(f"   • Total stations: {coverage['station_name']}")
+    print(f"   • Total cities: {coverage['city']}")
+    print(f"   • Total states: {coverage['state']}")
+    print(f"   • Total regions: {coverage['region']}")
     
     # Top 10 stations by data volume
     print(f"\n🏆 Top 10 Stations by Data Volume:")
-    station_counts = df['station_name'].value_counts().head(10)
+    station_counts = counts_by_appearance(df['station_name']).head(10)
+    station_city = df.drop_duplicates('station_name').set_index('station_name')['city']
     for station, count in station_counts.items():
-        city = df[df['station_name'] == station]['city'].iloc[0]
+        city = station_city[station]
         print(f"   • {station}, {city}: {count:,} records")
     
-    # Pollution level statistics
+    # Pollution level statistics (one grouped pass per statistic family)
     print(f"\n🌫️ Pollution Statistics:")
+    pollution_stats = df.groupby('parameter', observed=True)['value'].agg(['mean', 'max'])
+    
+    # Raw value/category-code arrays for the NumPy-side statistics
+    params = df['parameter'].cat
+    codes = params.codes.to_numpy()
+    vals = df['value'].to_numpy(dtype=np.float32, copy=False)
+    
+    # WHO guidelines compliance
+    limits = np.array([WHO_LIMITS[param] for param in params.categories], dtype=np.float32)
+    exceeding_counts = np.bincount(codes[vals > limits[codes]], minlength=len(limits))
+    param_counts_by_code = np.bincount(codes, minlength=len(limits))
+    
     for param in ['PM2.5', 'PM10']:
-        param_data = df[df['parameter'] == param]['value']
+        stats = pollution_stats.loc[param]
+        code = params.categories.get_loc(param)
+        # The data has no missing values, so no NaN-aware handling is needed
+        median, p95 = fast_quantiles(vals[codes == code], (0.5, 0.95))
         print(f"   • {param}:")
-        print(f"     - Mean: {param_data.mean():.1f} µg/m³")
-        print(f"     - Median: {param_data.median():.1f} µg/m³")
-        print(f"     - 95th percentile: {param_data.quantile(0.95):.1f} µg/m³")
-        print(f"     - Max: {param_data.max():.1f} µg/m³")
+        print(f"     - Mean: {stats['mean']:.1f} µg/m³")
+        print(f"     - Median: {median:.1f} µg/m³")
+        print(f"     - 95th percentile: {p95:.1f} µg/m³")
+        print(f"     - Max: {stats['max']:.1f} µg/m³")
         
-        # WHO guidelines compliance
-        if param == 'PM2.5':
-            who_limit = 15  # WHO 2021 guideline for PM2.5
-            exceeding = (param_data > who_limit).sum()
-            print(f"     - Exceeding WHO guidelines (>{who_limit} µg/m³): {exceeding:,} ({exceeding/len(param_data)*100:.1f}%)")
-        else:
-            who_limit = 45  # WHO 2021 guideline for PM10
-            exceeding = (param_data > who_limit).sum()
-            print(f"     - Exceeding WHO guidelines (>{who_limit} µg/m³): {exceeding:,} ({exceeding/len(param_data)*100:.1f}%)")
+        who_limit = WHO_LIMITS[param]
+        exceeding = exceeding_counts[code]
+        print(f"     - Exceeding WHO guidelines (>{who_limit} µg/m³): {exceeding:,} ({exceeding/param_counts_by_code[code]*100:.1f}%)")
     
     # Seasonal patterns
     print(f"\n🌡️ Seasonal Patterns:")
-    seasonal_avg = df.groupby(['season', 'parameter'])['value'].mean().round(1)
+    seasonal_avg = group_mean(df, ['season', 'parameter']).astype('float64').round(1)
     print(seasonal_avg.to_string())
     
     # Regional patterns
     print(f"\n🗺️ Regional Patterns:")
-    regional_avg = df.groupby(['region', 'parameter'])['value'].mean().round(1)
+    regional_avg = group_mean(df, ['region', 'parameter']).astype('float64').round(1)
     print(regional_avg.to_string())
     
-    # Most polluted cities
+    # Most polluted cities (both rankings from one city x parameter pass)
+    city_avg = group_mean(df, ['parameter', 'city']).unstack('parameter')
+    
     print(f"\n🚨 Most Polluted Cities (by average PM2.5):")
-    pm25_city_avg = df[df['parameter'] == 'PM2.5'].groupby('city')['value'].mean().sort_values(ascending=False).head(10)
+    pm25_city_avg = city_avg['PM2.5'].nlargest(10)
     for city, avg_pm25 in pm25_city_avg.items():
         print(f"   • {city}: {avg_pm25:.1f} µg/m³")
     
     print(f"\n🚨 Most Polluted Cities (by average PM10):")
-    pm10_city_avg = df[df['parameter'] == 'PM10'].groupby('city')['value'].mean().sort_values(ascending=False).head(10)
+    pm10_city_avg = city_avg['PM10'].nlargest(10)
     for city, avg_pm10 in pm10_city_avg.items():
         print(f"   • {city}: {avg_pm10:.1f} µg/m³")
     
     # Temporal patterns
     print(f"\n⏰ Temporal Patterns:")
-    df['datetime'] = pd.to_datetime(df['datetime'])
-    df['hour'] = df['datetime'].dt.hour
+    # Hour of day from the integer epoch-hours buffer, no .dt accessor or re-parse
+    epoch_hours = df['datetime'].to_numpy(dtype='datetime64[h]').view('i8')
+    df['hour'] = (epoch_hours % 24).astype(np.int8)
     
-    hourly_avg = df.groupby(['hour', 'parameter'])['value'].mean().round(1)
+    hourly_avg = group_mean(df, ['hour', 'parameter']).astype('float64').round(1)
     print("   Hourly averages:")
     print(hourly_avg.to_string())
     
@@ -117,11 +236,14 @@ def validate_for_ml_project():
     print("=" * 60)
     
     # Load ML-ready dataset
-    ml_df = pd.read_csv('india_pm_2023_ml_ready_20250703_2126.csv')
+    ml_path = 'india_pm_2023_ml_ready_20250703_2126.csv'
+    ml_df = load_dataset(ml_path, parse_dates=['datetime'], columns=ML_VALIDATION_COLUMNS,
+                         dtype=ML_VALIDATION_DTYPES)
+    ml_columns = dataset_columns(ml_path)
     
     print(f"🤖 ML-Ready Dataset:")
-    print(f"   • Shape: {ml_df.shape}")
-    print(f"   • Features: {list(ml_df.columns)}")
+    print(f"   • Shape: {(len(ml_df), len(ml_columns))}")
+    print(f"   • Features: {ml_columns}")
     
     # Check coordinate coverage for satellite matching
     print(f"\n📡 Coordinate Coverage (for satellite AOD matching):")
@@ -131,7 +253,6 @@ def validate_for_ml_project():
     
     # Check temporal coverage
     print(f"\n📅 Temporal Coverage (for time-series matching):")
-    ml_df['datetime'] = pd.to_datetime(ml_df['datetime'])
     print(f"   • Start date: {ml_df['datetime'].min()}")
     print(f"   • End date: {ml_df['datetime'].max()}")
     print(f"   • Total days: {(ml_df['datetime'].max() - ml_df['datetime'].min()).days + 1}")
@@ -140,15 +261,15 @@ def validate_for_ml_project():
     # Check for ML features
     print(f"\n🔬 ML Features Available:")
     ml_features = ['pm25', 'pm10', 'latitude', 'longitude', 'year', 'month', 'day', 'hour', 'season', 'region']
-    available_features = [f for f in ml_features if f in ml_df.columns]
+    available_features = [f for f in ml_features if f in ml_columns]
     print(f"   • Available features: {available_features}")
-    print(f"   • Missing features: {[f for f in ml_features if f not in ml_df.columns]}")
+    print(f"   • Missing features: {[f for f in ml_features if f not in ml_columns]}")
     
     # Sample coordinates for AOD matching
     print(f"\n📍 Sample Coordinates for AOD Data Matching:")
     sample_coords = ml_df[['station_name', 'city', 'latitude', 'longitude']].drop_duplicates().head(10)
-    for _, row in sample_coords.iterrows():
-        print(f"   • {row['station_name']}, {row['city']}: ({row['latitude']:.3f}, {row['longitude']:.3f})")
+    for station, city, lat, lon in sample_coords.itertuples(index=False, name=None):
+        print(f"   • {station}, {city}: ({lat:.3f}, {lon:.3f})")
     
     print(f"\n✅ DATASET READY FOR SATELLITE MONITORING PROJECT!")
     print("=" * 60)
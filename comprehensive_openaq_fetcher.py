@@ -5,29 +5,58 @@ This script provides multiple methods to fetch PM2.5 and PM10 data for India
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 import os
 
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; pandas is used when it is missing
+    pl = None
+
+# Columns of a processed measurements DataFrame
+MEASUREMENT_COLUMNS = [
+    "date", "location", "city", "parameter", "value", "unit",
+    "latitude", "longitude", "country"
+]
+
 class OpenAQDataFetcher:
     """
     A comprehensive class to fetch air quality data from OpenAQ API
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_retries=3):
         """
         Initialize the OpenAQ data fetcher
         
         Args:
             api_key (str, optional): OpenAQ API key for higher rate limits
+            max_retries (int): Maximum number of retry attempts per request
         """
         self.api_key = api_key
         self.base_url_v2 = "https://api.openaq.org/v2"
         self.base_url_v3 = "https://api.openaq.org/v3"
         self.headers = {'X-API-Key': api_key} if api_key else {}
         
+        # Pooled keep-alive session; the adapter retries rate-limited and
+        # failed requests with exponential backoff
+        self.session = requests.Session()
+        self.session.headers.update(self.get_headers())
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+        self.session.mount('https://', adapter)
+        
     def get_headers(self):
         """Get headers for API requests"""
         headers = {'User-Agent': 'OpenAQ-India-Data-Fetcher/1.0'}
@@ -35,41 +64,27 @@ class OpenAQDataFetcher:
             headers['X-API-Key'] = self.api_key
         return headers
     
-    def fetch_with_retry(self, url, params, max_retries=3):
+    def fetch_with_retry(self, url, params):
         """
-        Fetch data with retry logic
+        Fetch data through the pooled session (retries handled by its adapter)
         
         Args:
             url (str): API endpoint URL
             params (dict): Query parameters
-            max_retries (int): Maximum number of retry attempts
             
         Returns:
             dict: JSON response or None if failed
         """
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(
-                    url, 
-                    params=params, 
-                    headers=self.get_headers(),
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:  # Rate limited
-                    wait_time = 2 ** attempt
-                    print(f"   ⏱️ Rate limited, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"   ⚠️ HTTP {response.status_code}: {response.text[:100]}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"   ⚠️ Request failed (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                    
+        try:
+            response = self.session.get(url, params=params, timeout=30)
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️ Request failed: {e}")
+            return None
+        
+        if response.status_code == 200:
+            return response.json()
+        
+        print(f"   ⚠️ HTTP {response.status_code}: {response.text[:100]}")
         return None
     
     def fetch_locations_v2(self):
@@ -92,8 +107,13 @@ class OpenAQDataFetcher:
         
         return []
     
-    def fetch_measurements_v2(self, location_id=None, city=None, limit=1000):
-        """Fetch measurements using OpenAQ v2 API"""
+    def fetch_measurements_v2(self, location_id=None, city=None, limit=1000, concurrency=8):
+        """
+        Fetch measurements using OpenAQ v2 API
+        
+        Pages are requested in batches of `concurrency` at a time over the
+        pooled session; paging stops at the first short or empty page.
+        """
         print(f"🔄 Fetching measurements from OpenAQ v2 API...")
         
         url = f"{self.base_url_v2}/measurements"
@@ -109,59 +129,55 @@ class OpenAQDataFetcher:
             params["location_id"] = location_id
         if city:
             params["city"] = city
+        
+        def fetch_page(page):
+            return self.fetch_with_retry(url, {**params, "page": page})
             
         all_measurements = []
         page = 1
         
-        while True:
-            params["page"] = page
-            data = self.fetch_with_retry(url, params)
-            
-            if not data or "results" not in data or not data["results"]:
-                break
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                pages = range(page, page + concurrency)
+                last_page_reached = False
                 
-            measurements = data["results"]
-            all_measurements.extend(measurements)
-            
-            print(f"   📄 Page {page}: {len(measurements)} measurements")
-            
-            if len(measurements) < limit:
-                break
+                for page_number, data in zip(pages, executor.map(fetch_page, pages)):
+                    if not data or "results" not in data or not data["results"]:
+                        last_page_reached = True
+                        break
+                        
+                    measurements = data["results"]
+                    all_measurements.extend(measurements)
+                    
+                    print(f"   📄 Page {page_number}: {len(measurements)} measurements")
+                    
+                    if len(measurements) < limit:
+                        last_page_reached = True
+                        break
                 
-            page += 1
-            time.sleep(0.5)  # Be respectful to the API
+                if last_page_reached:
+                    break
+                    
+                page += concurrency
+                time.sleep(0.5)  # Be respectful to the API between batches
             
         return all_measurements
     
     def process_measurements(self, measurements):
         """Process raw measurements into structured DataFrame"""
-        processed_data = []
+        # Flatten the nested date/coordinates objects in one vectorized pass;
+        # missing keys simply become NaN
+        df = pd.json_normalize(measurements, sep="_", max_level=1)
+        df = df.rename(columns={
+            "date_utc": "date",
+            "coordinates_latitude": "latitude",
+            "coordinates_longitude": "longitude"
+        })
         
-        for measurement in measurements:
-            try:
-                # Safe extraction of nested data
-                coordinates = measurement.get("coordinates", {})
-                date_info = measurement.get("date", {})
-                
-                processed_measurement = {
-                    "date": date_info.get("utc", ""),
-                    "location": measurement.get("location", ""),
-                    "city": measurement.get("city", ""),
-                    "parameter": measurement.get("parameter", ""),
-                    "value": measurement.get("value", ""),
-                    "unit": measurement.get("unit", ""),
-                    "latitude": coordinates.get("latitude", ""),
-                    "longitude": coordinates.get("longitude", ""),
-                    "country": measurement.get("country", "India")
-                }
-                
-                processed_data.append(processed_measurement)
-                
-            except Exception as e:
-                print(f"   ⚠️ Error processing measurement: {e}")
-                continue
+        df = df.reindex(columns=MEASUREMENT_COLUMNS)
+        df["country"] = df["country"].fillna("India")
         
-        return pd.DataFrame(processed_data)
+        return df
     
     def fetch_india_data(self, max_records=10000):
         """
@@ -208,44 +224,38 @@ class OpenAQDataFetcher:
             {"city": "Noida", "lat": 28.5355, "lon": 77.3910, "pm25_avg": 80, "pm10_avg": 140},
         ]
         
-        sample_data = []
+        n_hours = 24
+        n_cities = len(cities_data)
+        city_names = [city_info["city"] for city_info in cities_data]
+        
+        # Hourly timestamps for the last 24 hours
         base_time = datetime.now()
+        timestamps = np.array([(base_time - timedelta(hours=hour)).isoformat() + "Z"
+                               for hour in range(n_hours)])
         
-        # Generate hourly data for the last 24 hours
-        for hour in range(24):
-            timestamp = base_time - timedelta(hours=hour)
-            
-            for city_info in cities_data:
-                # Generate realistic variations
-                import random
-                pm25_variation = random.uniform(0.7, 1.3)
-                pm10_variation = random.uniform(0.8, 1.2)
-                
-                # PM2.5 data
-                sample_data.append({
-                    "date": timestamp.isoformat() + "Z",
-                    "location": f"Monitoring Station {city_info['city']}",
-                    "city": city_info["city"],
-                    "parameter": "pm25",
-                    "value": round(city_info["pm25_avg"] * pm25_variation, 1),
-                    "unit": "µg/m³",
-                    "latitude": city_info["lat"],
-                    "longitude": city_info["lon"],
-                    "country": "India"
-                })
-                
-                # PM10 data
-                sample_data.append({
-                    "date": timestamp.isoformat() + "Z",
-                    "location": f"Monitoring Station {city_info['city']}",
-                    "city": city_info["city"],
-                    "parameter": "pm10",
-                    "value": round(city_info["pm10_avg"] * pm10_variation, 1),
-                    "unit": "µg/m³",
-                    "latitude": city_info["lat"],
-                    "longitude": city_info["lon"],
-                    "country": "India"
-                })
+        # Realistic variations for every (hour, city, parameter) cell in one draw;
+        # PM2.5 varies by ±30%, PM10 by ±20%
+        pm_avgs = np.array([[c["pm25_avg"], c["pm10_avg"]] for c in cities_data], dtype=np.float64)
+        variations = np.random.uniform([0.7, 0.8], [1.3, 1.2], size=(n_hours, n_cities, 2))
+        values = np.round(pm_avgs[None, :, :] * variations, 1)
+        
+        # Row order is hour -> city -> (PM2.5, PM10), matching the raw API layout
+        hour_idx = np.repeat(np.arange(n_hours), n_cities * 2)
+        city_idx = np.tile(np.repeat(np.arange(n_cities), 2), n_hours)
+        param_idx = np.tile([0, 1], n_hours * n_cities)
+        
+        sample_data = {
+            "date": timestamps[hour_idx],
+            "location": pd.Categorical.from_codes(
+                city_idx, categories=[f"Monitoring Station {city}" for city in city_names]),
+            "city": pd.Categorical.from_codes(city_idx, categories=city_names),
+            "parameter": pd.Categorical.from_codes(param_idx, categories=["pm25", "pm10"]),
+            "value": values.ravel(),
+            "unit": "µg/m³",
+            "latitude": np.array([c["lat"] for c in cities_data])[city_idx],
+            "longitude": np.array([c["lon"] for c in cities_data])[city_idx],
+            "country": "India"
+        }
         
         df = pd.DataFrame(sample_data)
         print(f"✅ Created comprehensive sample dataset with {len(df)} records")
@@ -254,13 +264,18 @@ class OpenAQDataFetcher:
         return df
     
     def save_data(self, df, filename_prefix="india_air_quality"):
-        """Save DataFrame to CSV with timestamp"""
+        """Save DataFrame to CSV (plus a Parquet copy) with timestamp"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
         filename = f"{filename_prefix}_{timestamp}.csv"
         
         df.to_csv(filename, index=False)
         print(f"💾 Data saved to: {filename}")
         
+        # Columnar copy for the analysis scripts, much faster to reload than CSV
+        parquet_filename = filename.replace(".csv", ".parquet")
+        df.to_parquet(parquet_filename, compression="zstd", use_dictionary=True, index=False)
+        print(f"💾 Parquet copy saved to: {parquet_filename}")
+        
         return filename
     
     def analyze_data(self, df):
@@ -319,10 +334,31 @@ class OpenAQDataFetcher:
         print(f"\n🏙️ City-wise average pollution levels:")
         try:
             df['value_numeric'] = pd.to_numeric(df['value'], errors='coerce')
-            city_avg = df.groupby(['city', 'parameter'])['value_numeric'].mean().round(1)
-            print(city_avg.to_string())
+            print(self.city_averages(df).to_string())
         except:
             pass
+    
+    def city_averages(self, df):
+        """
+        Average numeric value per (city, parameter)
+        
+        Runs as a lazy, multithreaded Polars query when Polars is installed,
+        falling back to a pandas groupby otherwise.
+        """
+        if pl is None:
+            return df.groupby(['city', 'parameter'])['value_numeric'].mean().round(1)
+        
+        city_avg = (
+            pl.from_pandas(df[['city', 'parameter', 'value_numeric']])
+            .lazy()
+            .with_columns(pl.col('city', 'parameter').cast(pl.String))
+            .drop_nulls(['city', 'parameter'])  # As the pandas groupby drops NaN keys
+            .group_by(['city', 'parameter'])
+            .agg(pl.col('value_numeric').mean())
+            .sort(['city', 'parameter'])
+            .collect()
+        )
+        return city_avg.to_pandas().set_index(['city', 'parameter'])['value_numeric'].round(1)
 
 def main():
     """Main function to run the comprehensive data fetcher"""
@@ -5,23 +5,79 @@ This script fetches PM2.5 and PM10 data from all available stations for the year
 Specifically designed for satellite-based air pollution monitoring research
 """
 
-import requests
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
 import json
 import os
 from typing import List, Dict, Optional
 
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; only the Parquet copy needs it
+    pa = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; nearest_station scans all stations without it
+    cKDTree = None
+
+EARTH_RADIUS_KM = 6371.0
+
+# AQI category per value, from the PM2.5 and PM10 breakpoints (µg/m³)
+AQI_CATEGORIES = ['Good', 'Moderate', 'Unhealthy for Sensitive Groups', 'Unhealthy', 'Very Unhealthy', 'Hazardous']
+PM25_AQI_BINS = [-np.inf, 12, 35.4, 55.4, 150.4, 250.4, np.inf]
+PM10_AQI_BINS = [-np.inf, 54, 154, 254, 354, 424, np.inf]
+
+# pandas day names in weekday order (Monday == 0)
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Geographical region of each state, as a single lookup table
+STATE_REGIONS = {
+    **dict.fromkeys(['Delhi', 'Punjab', 'Haryana', 'Himachal Pradesh', 'Jammu and Kashmir', 'Ladakh',
+                     'Uttarakhand', 'Uttar Pradesh'], 'North'),
+    **dict.fromkeys(['Andhra Pradesh', 'Karnataka', 'Kerala', 'Tamil Nadu', 'Telangana'], 'South'),
+    **dict.fromkeys(['West Bengal', 'Odisha', 'Jharkhand', 'Bihar', 'Assam', 'Meghalaya', 'Manipur',
+                     'Mizoram', 'Nagaland', 'Tripura', 'Arunachal Pradesh', 'Sikkim'], 'East'),
+    **dict.fromkeys(['Maharashtra', 'Gujarat', 'Rajasthan', 'Goa', 'Madhya Pradesh', 'Chhattisgarh'], 'West')
+}
+
+# Indian climate season of each month (index 1-12), as used by get_season
+SEASON_BY_MONTH = ('', 'Winter', 'Winter', 'Summer', 'Summer', 'Summer', 'Monsoon', 'Monsoon',
+                   'Monsoon', 'Monsoon', 'Post-Monsoon', 'Post-Monsoon', 'Winter')
+
+def unit_sphere_xyz(lat, lon):
+    """Cartesian (x, y, z) on the unit sphere for latitude/longitude arrays in degrees"""
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.sin(lat_r)], axis=1)
+
+def exact_values(values):
+    """
+    float64 copy of the float32 'value' column
+    
+    Values are generated to one decimal, so rounding the widened floats
+    restores exactly the numbers a float64 column would have held; used
+    wherever values are compared or aggregated.
+    """
+    return values.astype(np.float64).round(1)
+
 class IndiaAirQualityFetcher:
     """
     Comprehensive data fetcher for India's air quality data
     Sources: CPCB, State Pollution Control Boards, and other monitoring networks
     """
     
-    def __init__(self):
-        """Initialize the fetcher with various data sources"""
+    def __init__(self, seed=2023):
+        """
+        Initialize the fetcher with various data sources
+        
+        Args:
+            seed: Seed for the random variation in the generated dataset,
+                so repeated runs produce the same values
+        """
+        self.rng = np.random.default_rng(seed)
+        
         self.base_urls = {
             'cpcb': 'https://api.cpcb.gov.in/aqi/v1.0',
             'openaq': 'https://api.openaq.org/v2',
@@ -47,31 +103,9 @@ class IndiaAirQualityFetcher:
             'Navi Mumbai', 'Allahabad', 'Ranchi', 'Howrah', 'Coimbatore', 'Jabalpur',
             'Gwalior', 'Vijayawada', 'Jodhpur', 'Madurai', 'Raipur', 'Kota'
         ]
-    
-    def generate_date_range_2023(self):
-        """Generate all dates for 2023"""
-        start_date = datetime(2023, 1, 1)
-        end_date = datetime(2023, 12, 31)
-        
-        dates = []
-        current_date = start_date
-        while current_date <= end_date:
-            dates.append(current_date.strftime('%Y-%m-%d'))
-            current_date += timedelta(days=1)
-        
-        return dates
-    
-    def create_comprehensive_2023_dataset(self):
-        """
-        Create a comprehensive dataset for 2023 with all major monitoring stations
-        This includes realistic data patterns based on actual Indian air quality trends
-        """
-        print("🏭 Creating comprehensive 2023 PM dataset for India...")
-        print("📅 Generating data for all 365 days of 2023")
-        print("🗺️ Covering all major cities and monitoring stations")
         
         # Extended list of monitoring stations with realistic coordinates
-        monitoring_stations = [
+        self.monitoring_stations = [
             # Delhi NCR - Multiple stations
             {'station': 'Anand Vihar', 'city': 'Delhi', 'state': 'Delhi', 'lat': 28.6469, 'lon': 77.3152, 'type': 'Urban', 'pm25_base': 120, 'pm10_base': 200},
             {'station': 'Punjabi Bagh', 'city': 'Delhi', 'state': 'Delhi', 'lat': 28.6742, 'lon': 77.1341, 'type': 'Urban', 'pm25_base': 110, 'pm10_base': 180},
@@ -122,122 +156,153 @@ class IndiaAirQualityFetcher:
             {'station': 'Srinagar Central', 'city': 'Srinagar', 'state': 'Jammu and Kashmir', 'lat': 34.0837, 'lon': 74.7973, 'type': 'Urban', 'pm25_base': 45, 'pm10_base': 75},
         ]
         
+        # Stations as points on the unit sphere, indexed once for nearest-station queries
+        self.station_xyz = unit_sphere_xyz(
+            np.array([station_info['lat'] for station_info in self.monitoring_stations]),
+            np.array([station_info['lon'] for station_info in self.monitoring_stations])
+        )
+        self.station_tree = cKDTree(self.station_xyz) if cKDTree is not None else None
+    
+    def nearest_station(self, lat, lon, k=1):
+        """
+        Find the monitoring stations closest to a point
+        
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            k: Number of stations to return
+        
+        Returns:
+            List of (station_info, distance_km) tuples, nearest first
+        """
+        k = min(k, len(self.monitoring_stations))
+        query = unit_sphere_xyz(np.array([lat]), np.array([lon]))[0]
+        
+        if self.station_tree is not None:
+            chords, indices = self.station_tree.query(query, k=k)
+            chords, indices = np.atleast_1d(chords), np.atleast_1d(indices)
+        else:
+            # Without scipy: brute-force chord lengths, fine for a few dozen stations
+            all_chords = np.linalg.norm(self.station_xyz - query, axis=1)
+            indices = np.argsort(all_chords, kind='stable')[:k]
+            chords = all_chords[indices]
+        
+        # Chord length on the unit sphere -> great-circle distance
+        distances_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chords / 2, 0, 1))
+        return [(self.monitoring_stations[i], float(d)) for i, d in zip(indices, distances_km)]
+    
+    def generate_date_range_2023(self):
+        """Generate all dates for 2023"""
+        return pd.date_range('2023-01-01', '2023-12-31', freq='D').strftime('%Y-%m-%d').tolist()
+    
+    def create_comprehensive_2023_dataset(self):
+        """
+        Create a comprehensive dataset for 2023 with all major monitoring stations
+        This includes realistic data patterns based on actual Indian air quality trends
+        """
+        print("🏭 Creating comprehensive 2023 PM dataset for India...")
+        print("📅 Generating data for all 365 days of 2023")
+        print("🗺️ Covering all major cities and monitoring stations")
+        
+        monitoring_stations = self.monitoring_stations
+        
         # Generate 2023 date range
         dates_2023 = self.generate_date_range_2023()
         
-        # Create comprehensive dataset
-        all_data = []
+        # Parse the dates once and take every calendar field as an array
+        date_index = pd.to_datetime(dates_2023, format='%Y-%m-%d')
+        months = date_index.month.to_numpy()
+        days = date_index.day.to_numpy()
+        day_of_year = date_index.dayofyear.to_numpy()
         
-        print(f"📊 Generating data for {len(monitoring_stations)} stations...")
+        # Multiple readings per day (every 6 hours); hour 24 is stamped 00:00 of the same date
+        hours = np.array([6, 12, 18, 24])
         
+        print(f"📊 Generating data for {len(monitoring_stations)} stations...")
         for station_info in monitoring_stations:
             print(f"   📍 Processing {station_info['station']}, {station_info['city']}")
-            
-            for date_str in dates_2023:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                
-                # Generate multiple readings per day (every 6 hours)
-                for hour in [6, 12, 18, 24]:
-                    timestamp = date_obj.replace(hour=hour%24)
-                    
-                    # Apply seasonal and weather patterns
-                    month = date_obj.month
-                    day_of_year = date_obj.timetuple().tm_yday
-                    
-                    # Winter pollution (Nov-Feb) - higher values
-                    if month in [11, 12, 1, 2]:
-                        seasonal_factor = 1.4
-                    # Summer (Mar-May) - moderate values
-                    elif month in [3, 4, 5]:
-                        seasonal_factor = 1.1
-                    # Monsoon (Jun-Sep) - lower values due to rain
-                    elif month in [6, 7, 8, 9]:
-                        seasonal_factor = 0.7
-                    # Post-monsoon (Oct) - higher values
-                    else:
-                        seasonal_factor = 1.2
-                    
-                    # Add daily variation
-                    daily_variation = 0.8 + 0.4 * np.sin(2 * np.pi * day_of_year / 365)
-                    
-                    # Add hourly variation (higher in morning and evening)
-                    if hour in [6, 18]:
-                        hourly_factor = 1.2
-                    elif hour in [12, 24]:
-                        hourly_factor = 0.9
-                    else:
-                        hourly_factor = 1.0
-                    
-                    # Add random variation
-                    random_factor = np.random.uniform(0.7, 1.3)
-                    
-                    # Calculate final values
-                    pm25_value = station_info['pm25_base'] * seasonal_factor * daily_variation * hourly_factor * random_factor
-                    pm10_value = station_info['pm10_base'] * seasonal_factor * daily_variation * hourly_factor * random_factor
-                    
-                    # Ensure realistic ranges
-                    pm25_value = max(5, min(500, pm25_value))
-                    pm10_value = max(10, min(800, pm10_value))
-                    
-                    # PM2.5 record
-                    all_data.append({
-                        'datetime': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                        'date': date_str,
-                        'time': f"{hour:02d}:00:00",
-                        'station_name': station_info['station'],
-                        'city': station_info['city'],
-                        'state': station_info['state'],
-                        'parameter': 'PM2.5',
-                        'value': round(pm25_value, 1),
-                        'unit': 'µg/m³',
-                        'latitude': station_info['lat'],
-                        'longitude': station_info['lon'],
-                        'station_type': station_info['type'],
-                        'country': 'India',
-                        'year': 2023,
-                        'month': month,
-                        'day': date_obj.day,
-                        'hour': hour,
-                        'season': self.get_season(month),
-                        'data_source': 'Simulated_CPCB_Compatible'
-                    })
-                    
-                    # PM10 record
-                    all_data.append({
-                        'datetime': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                        'date': date_str,
-                        'time': f"{hour:02d}:00:00",
-                        'station_name': station_info['station'],
-                        'city': station_info['city'],
-                        'state': station_info['state'],
-                        'parameter': 'PM10',
-                        'value': round(pm10_value, 1),
-                        'unit': 'µg/m³',
-                        'latitude': station_info['lat'],
-                        'longitude': station_info['lon'],
-                        'station_type': station_info['type'],
-                        'country': 'India',
-                        'year': 2023,
-                        'month': month,
-                        'day': date_obj.day,
-                        'hour': hour,
-                        'season': self.get_season(month),
-                        'data_source': 'Simulated_CPCB_Compatible'
-                    })
-        
-        print(f"✅ Generated {len(all_data)} records")
-        return pd.DataFrame(all_data)
+        
+        # All stations are generated together on one (station, day, hour) grid; the whole
+        # year takes a few vectorized calls, so there is no per-station work to farm out
+        n_stations, n_days, n_hours = len(monitoring_stations), len(dates_2023), len(hours)
+        
+        # Apply seasonal and weather patterns, one factor per day:
+        # winter (Nov-Feb) higher, summer (Mar-May) moderate,
+        # monsoon (Jun-Sep) lower due to rain, post-monsoon (Oct) higher
+        seasonal_factor = np.select(
+            [np.isin(months, [11, 12, 1, 2]), np.isin(months, [3, 4, 5]), np.isin(months, [6, 7, 8, 9])],
+            [1.4, 1.1, 0.7],
+            default=1.2
+        )
+        daily_variation = 0.8 + 0.4 * np.sin(2 * np.pi * day_of_year / 365)
+        
+        # Hourly variation (higher in morning and evening)
+        hourly_factor = np.select([np.isin(hours, [6, 18]), np.isin(hours, [12, 24])], [1.2, 0.9], default=1.0)
+        
+        # Random variation, one draw per station/day/hour shared by PM2.5 and PM10
+        random_factor = self.rng.uniform(0.7, 1.3, size=(n_stations, n_days, n_hours))
+        
+        # Calculate final values on a (station, day, hour) grid, kept in realistic ranges
+        pm25_base = np.array([station_info['pm25_base'] for station_info in monitoring_stations])
+        pm10_base = np.array([station_info['pm10_base'] for station_info in monitoring_stations])
+        pm25_values = np.clip(pm25_base[:, None, None] * seasonal_factor[None, :, None] * daily_variation[None, :, None]
+                              * hourly_factor[None, None, :] * random_factor, 5, 500)
+        pm10_values = np.clip(pm10_base[:, None, None] * seasonal_factor[None, :, None] * daily_variation[None, :, None]
+                              * hourly_factor[None, None, :] * random_factor, 10, 800)
+        
+        # Flatten to rows ordered station -> day -> hour -> (PM2.5, PM10)
+        per_station = n_days * n_hours * 2
+        per_day = n_hours * 2
+        # One station's (day, hour) timestamps, formatted once and tiled across stations;
+        # the hour-24 reading is stamped 00:00 of its own day
+        timestamps = date_index.to_numpy()[:, None] + (hours % 24).astype('timedelta64[h]')
+        datetime_strs = pd.DatetimeIndex(timestamps.ravel()).strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+        time_strs = np.array([f"{hour:02d}:00:00" for hour in hours])
+        
+        def station_column(key):
+            return np.repeat([station_info[key] for station_info in monitoring_stations], per_station)
+        
+        def station_categorical(key):
+            # Repeat small integer codes instead of strings; categories sorted as pandas infers them
+            categories, codes = np.unique([station_info[key] for station_info in monitoring_stations], return_inverse=True)
+            return pd.Categorical.from_codes(np.repeat(codes.astype(np.int8), per_station), categories=categories)
+        
+        def day_column(values):
+            return np.tile(np.repeat(values, per_day), n_stations)
+        
+        seasons, season_codes = np.unique(np.take(SEASON_BY_MONTH, months), return_inverse=True)
+        
+        df = pd.DataFrame({
+            'datetime': np.tile(np.repeat(datetime_strs, 2), n_stations),
+            'date': day_column(dates_2023),
+            'time': np.tile(np.repeat(time_strs, 2), n_stations * n_days),
+            'station_name': station_categorical('station'),
+            'city': station_categorical('city'),
+            'state': station_categorical('state'),
+            'parameter': pd.Categorical.from_codes(np.tile(np.array([1, 0], dtype=np.int8), n_stations * n_days * n_hours),
+                                                   categories=['PM10', 'PM2.5']),
+            'value': np.round(np.stack([pm25_values, pm10_values], axis=-1).ravel(), 1).astype(np.float32),
+            'unit': 'µg/m³',
+            'latitude': station_column('lat'),
+            'longitude': station_column('lon'),
+            'station_type': station_categorical('type'),
+            'country': 'India',
+            'year': np.uint16(2023),
+            'month': day_column(months.astype(np.uint8)),
+            'day': day_column(days.astype(np.uint8)),
+            'hour': np.tile(np.repeat(hours.astype(np.uint8), 2), n_stations * n_days),
+            'season': pd.Categorical.from_codes(day_column(season_codes.astype(np.int8)), categories=seasons),
+            'data_source': pd.Categorical.from_codes(np.zeros(n_stations * per_station, dtype=np.int8),
+                                                     categories=['Simulated_CPCB_Compatible'])
+        })
+        
+        print(f"✅ Generated {len(df)} records")
+        return df
     
-    def get_season(self, month):
-        """Get season based on month for Indian climate"""
-        if month in [12, 1, 2]:
-            return 'Winter'
-        elif month in [3, 4, 5]:
-            return 'Summer'
-        elif month in [6, 7, 8, 9]:
-            return 'Monsoon'
-        else:
-            return 'Post-Monsoon'
+    @staticmethod
+    def get_season(month):
+        """Get season based on month (1-12) for Indian climate"""
+        return SEASON_BY_MONTH[month]
     
     def add_metadata_columns(self, df):
         """Add additional metadata columns useful for ML modeling"""
@@ -246,48 +311,24 @@ class IndiaAirQualityFetcher:
         # Convert datetime
         df['datetime'] = pd.to_datetime(df['datetime'])
         
-        # Add temporal features
-        df['weekday'] = df['datetime'].dt.day_name()
-        df['is_weekend'] = df['datetime'].dt.weekday >= 5
-        df['quarter'] = df['datetime'].dt.quarter
-        df['week_of_year'] = df['datetime'].dt.isocalendar().week
-        
-        # Add pollution level categories
-        def categorize_pm25(value):
-            if value <= 12: return 'Good'
-            elif value <= 35.4: return 'Moderate'
-            elif value <= 55.4: return 'Unhealthy for Sensitive Groups'
-            elif value <= 150.4: return 'Unhealthy'
-            elif value <= 250.4: return 'Very Unhealthy'
-            else: return 'Hazardous'
-        
-        def categorize_pm10(value):
-            if value <= 54: return 'Good'
-            elif value <= 154: return 'Moderate'
-            elif value <= 254: return 'Unhealthy for Sensitive Groups'
-            elif value <= 354: return 'Unhealthy'
-            elif value <= 424: return 'Very Unhealthy'
-            else: return 'Hazardous'
-        
-        # Apply categorization
-        df['aqi_category'] = df.apply(lambda row: 
-            categorize_pm25(row['value']) if row['parameter'] == 'PM2.5' 
-            else categorize_pm10(row['value']), axis=1)
-        
-        # Add geographical regions
-        def get_region(state):
-            north = ['Delhi', 'Punjab', 'Haryana', 'Himachal Pradesh', 'Jammu and Kashmir', 'Ladakh', 'Uttarakhand', 'Uttar Pradesh']
-            south = ['Andhra Pradesh', 'Karnataka', 'Kerala', 'Tamil Nadu', 'Telangana']
-            east = ['West Bengal', 'Odisha', 'Jharkhand', 'Bihar', 'Assam', 'Meghalaya', 'Manipur', 'Mizoram', 'Nagaland', 'Tripura', 'Arunachal Pradesh', 'Sikkim']
-            west = ['Maharashtra', 'Gujarat', 'Rajasthan', 'Goa', 'Madhya Pradesh', 'Chhattisgarh']
-            
-            if state in north: return 'North'
-            elif state in south: return 'South'
-            elif state in east: return 'East'
-            elif state in west: return 'West'
-            else: return 'Central'
-        
-        df['region'] = df['state'].apply(get_region)
+        # Add temporal features, all decoded from one DatetimeIndex
+        datetimes = pd.DatetimeIndex(df['datetime'])
+        weekday = datetimes.weekday
+        df['weekday'] = pd.Categorical.from_codes(weekday, categories=WEEKDAY_NAMES)
+        df['is_weekend'] = weekday >= 5
+        df['quarter'] = datetimes.quarter.astype(np.uint8)
+        df['week_of_year'] = datetimes.isocalendar().week.to_numpy().astype(np.uint8)
+        
+        # Add pollution level categories; bins are right-inclusive (value <= upper edge)
+        values = exact_values(df['value'].to_numpy())
+        is_pm25 = df['parameter'].eq('PM2.5').to_numpy()
+        aqi_codes = np.empty(len(df), dtype=np.int8)
+        aqi_codes[is_pm25] = pd.cut(values[is_pm25], PM25_AQI_BINS, labels=False)
+        aqi_codes[~is_pm25] = pd.cut(values[~is_pm25], PM10_AQI_BINS, labels=False)
+        df['aqi_category'] = pd.Categorical.from_codes(aqi_codes, categories=AQI_CATEGORIES, ordered=True)
+        
+        # Add geographical regions; states not listed fall under Central
+        df['region'] = df['state'].map(STATE_REGIONS).fillna('Central').astype('category')
         
         return df
     
@@ -300,15 +341,23 @@ class IndiaAirQualityFetcher:
         df.to_csv(filename, index=False)
         print(f"💾 Complete dataset saved: {filename}")
         
-        # Create separate files for PM2.5 and PM10
-        pm25_df = df[df['parameter'] == 'PM2.5'].copy()
-        pm10_df = df[df['parameter'] == 'PM10'].copy()
+        # Parquet copy: compressed columnar file, much faster to load than the CSV.
+        # Written in one pass: the frame is already whole in memory (it is built
+        # column-wise, not station by station), and per-station row groups would only
+        # split it into small groups that compress several times worse
+        if pa is not None:
+            parquet_filename = f"{filename_prefix}_{timestamp}.parquet"
+            df.to_parquet(parquet_filename, engine='pyarrow', compression='zstd', row_group_size=1_000_000, index=False)
+            print(f"💾 Parquet copy saved: {parquet_filename}")
         
-        pm25_filename = f"india_pm25_2023_complete_{timestamp}.csv"
-        pm10_filename = f"india_pm10_2023_complete_{timestamp}.csv"
+        # Create separate files for PM2.5 and PM10, written from the groups without extra copies
+        parameter_filenames = {}
+        for param, param_df in df.groupby('parameter', sort=False, observed=True):
+            parameter_filenames[param] = f"india_{param.lower().replace('.', '')}_2023_complete_{timestamp}.csv"
+            param_df.to_csv(parameter_filenames[param], index=False)
         
-        pm25_df.to_csv(pm25_filename, index=False)
-        pm10_df.to_csv(pm10_filename, index=False)
+        pm25_filename = parameter_filenames['PM2.5']
+        pm10_filename = parameter_filenames['PM10']
         
         print(f"💾 PM2.5 dataset saved: {pm25_filename}")
         print(f"💾 PM10 dataset saved: {pm10_filename}")
@@ -325,104 +374,84 @@ class IndiaAirQualityFetcher:
         """Generate comprehensive summary statistics"""
         print("📈 Generating summary statistics...")
         
-        summary_data = []
+        df = df.assign(value=exact_values(df['value']))
         
-        # Overall statistics
-        for param in ['PM2.5', 'PM10']:
-            param_data = df[df['parameter'] == param]['value']
-            
-            summary_data.append({
-                'parameter': param,
-                'statistic': 'Overall',
-                'category': 'All India',
-                'count': len(param_data),
-                'mean': round(param_data.mean(), 2),
-                'median': round(param_data.median(), 2),
-                'std': round(param_data.std(), 2),
-                'min': round(param_data.min(), 2),
-                'max': round(param_data.max(), 2),
-                'q25': round(param_data.quantile(0.25), 2),
-                'q75': round(param_data.quantile(0.75), 2)
-            })
-        
-        # City-wise statistics
-        for city in df['city'].unique():
-            city_data = df[df['city'] == city]
+        def grouped_stats(keys):
+            # One grouped reduction per table instead of a masked scan per category
+            grouped = df.groupby(keys, observed=True, sort=False)['value']
+            stats = grouped.agg(['count', 'mean', 'median', 'std', 'min', 'max'])
+            quartiles = grouped.quantile([0.25, 0.75]).unstack()
+            stats['q25'] = quartiles[0.25]
+            stats['q75'] = quartiles[0.75]
             
-            for param in ['PM2.5', 'PM10']:
-                param_data = city_data[city_data['parameter'] == param]['value']
-                
-                if len(param_data) > 0:
-                    summary_data.append({
-                        'parameter': param,
-                        'statistic': 'City',
-                        'category': city,
-                        'count': len(param_data),
-                        'mean': round(param_data.mean(), 2),
-                        'median': round(param_data.median(), 2),
-                        'std': round(param_data.std(), 2),
-                        'min': round(param_data.min(), 2),
-                        'max': round(param_data.max(), 2),
-                        'q25': round(param_data.quantile(0.25), 2),
-                        'q75': round(param_data.quantile(0.75), 2)
-                    })
-        
-        # Seasonal statistics
-        for season in df['season'].unique():
-            season_data = df[df['season'] == season]
-            
-            for param in ['PM2.5', 'PM10']:
-                param_data = season_data[season_data['parameter'] == param]['value']
-                
-                if len(param_data) > 0:
-                    summary_data.append({
-                        'parameter': param,
-                        'statistic': 'Season',
-                        'category': season,
-                        'count': len(param_data),
-                        'mean': round(param_data.mean(), 2),
-                        'median': round(param_data.median(), 2),
-                        'std': round(param_data.std(), 2),
-                        'min': round(param_data.min(), 2),
-                        'max': round(param_data.max(), 2),
-                        'q25': round(param_data.quantile(0.25), 2),
-                        'q75': round(param_data.quantile(0.75), 2)
-                    })
-        
-        return pd.DataFrame(summary_data)
+            # Categories in order of appearance, PM2.5 before PM10 within each
+            if len(keys) == 1:
+                return stats.reindex(['PM2.5', 'PM10'])
+            return stats.reindex(['PM2.5', 'PM10'], level='parameter')
+        
+        # Overall, city-wise and seasonal statistics
+        overall = grouped_stats(['parameter']).reset_index()
+        overall.insert(1, 'category', 'All India')
+        by_city = grouped_stats(['city', 'parameter']).reset_index().rename(columns={'city': 'category'})
+        by_season = grouped_stats(['season', 'parameter']).reset_index().rename(columns={'season': 'category'})
+        
+        summary = pd.concat([overall.assign(statistic='Overall'),
+                             by_city.assign(statistic='City'),
+                             by_season.assign(statistic='Season')], ignore_index=True)
+        summary['category'] = summary['category'].astype(str)
+        
+        columns = ['parameter', 'statistic', 'category', 'count', 'mean', 'median', 'std', 'min', 'max', 'q25', 'q75']
+        return summary[columns].round(2)
     
     def create_ml_ready_dataset(self, df):
         """Create a machine learning ready dataset"""
         print("🤖 Creating ML-ready dataset...")
         
-        # Create pivot table for easier ML processing
-        ml_df = df.pivot_table(
-            index=['datetime', 'station_name', 'city', 'state', 'latitude', 'longitude', 'season', 'region'],
-            columns='parameter',
-            values='value',
-            aggfunc='mean'
-        ).reset_index()
-        
-        # Rename columns
-        ml_df.columns.name = None
-        ml_df = ml_df.rename(columns={'PM2.5': 'pm25', 'PM10': 'pm10'})
-        
-        # Add temporal features
-        ml_df['year'] = ml_df['datetime'].dt.year
-        ml_df['month'] = ml_df['datetime'].dt.month
-        ml_df['day'] = ml_df['datetime'].dt.day
-        ml_df['hour'] = ml_df['datetime'].dt.hour
-        ml_df['weekday'] = ml_df['datetime'].dt.weekday
-        ml_df['is_weekend'] = ml_df['weekday'] >= 5
-        
-        # Add lag features (previous day values)
+        keys = ['datetime', 'station_name', 'city', 'state', 'latitude', 'longitude', 'season', 'region']
+        pm25_rows, pm10_rows = df.iloc[0::2], df.iloc[1::2]
+        
+        # The generator emits each reading as adjacent (PM2.5, PM10) rows, so the wide
+        # frame is read straight off the pairs; any other layout is reshaped by unstack
+        is_paired = (len(pm25_rows) == len(pm10_rows)
+                     and pm25_rows['parameter'].eq('PM2.5').all() and pm10_rows['parameter'].eq('PM10').all()
+                     and (pm25_rows['datetime'].to_numpy() == pm10_rows['datetime'].to_numpy()).all()
+                     and (pm25_rows['station_name'].to_numpy() == pm10_rows['station_name'].to_numpy()).all())
+        
+        if is_paired:
+            ml_df = pm25_rows[keys].reset_index(drop=True).assign(
+                pm10=exact_values(pm10_rows['value'].to_numpy()),
+                pm25=exact_values(pm25_rows['value'].to_numpy())
+            )
+        else:
+            # Each (reading, parameter) pair is unique, so a plain unstack does the job
+            # without pivot_table's mean reduction
+            ml_df = df.assign(value=exact_values(df['value'])).set_index(
+                keys + ['parameter']
+            )['value'].unstack('parameter').reset_index()
+            
+            # Rename columns
+            ml_df.columns.name = None
+            ml_df = ml_df.rename(columns={'PM2.5': 'pm25', 'PM10': 'pm10'})
+        
+        # Add temporal features, all decoded from one DatetimeIndex; hour is the
+        # clock hour here, so the midnight reading is 0 rather than 24
+        datetimes = pd.DatetimeIndex(ml_df['datetime'])
+        weekday = datetimes.weekday.astype(np.uint8)
+        ml_df = ml_df.assign(
+            year=datetimes.year.astype(np.uint16),
+            month=datetimes.month.astype(np.uint8),
+            day=datetimes.day.astype(np.uint8),
+            hour=datetimes.hour.astype(np.uint8),
+            weekday=weekday,
+            is_weekend=weekday >= 5
+        )
+        
+        # Add lag features (previous day values) and rolling averages,
+        # all from one grouping of the sorted frame
         ml_df = ml_df.sort_values(['station_name', 'datetime'])
-        ml_df['pm25_lag1'] = ml_df.groupby('station_name')['pm25'].shift(1)
-        ml_df['pm10_lag1'] = ml_df.groupby('station_name')['pm10'].shift(1)
-        
-        # Add rolling averages
-        ml_df['pm25_rolling_7d'] = ml_df.groupby('station_name')['pm25'].rolling(7).mean().reset_index(0, drop=True)
-        ml_df['pm10_rolling_7d'] = ml_df.groupby('station_name')['pm10'].rolling(7).mean().reset_index(0, drop=True)
+        grouped = ml_df.groupby('station_name', sort=False, observed=True)[['pm25', 'pm10']]
+        ml_df = ml_df.join(grouped.shift(1).add_suffix('_lag1'))
+        ml_df = ml_df.join(grouped.rolling(7).mean().reset_index(level=0, drop=True).add_suffix('_rolling_7d'))
         
         return ml_df
     
@@ -432,15 +461,22 @@ class IndiaAirQualityFetcher:
         print("=" * 60)
         
         # Basic statistics
+        unique_counts = df[['station_name', 'city', 'state']].nunique()
         print(f"📈 Total records: {len(df):,}")
-        print(f"📍 Total stations: {df['station_name'].nunique()}")
-        print(f"🏙️ Total cities: {df['city'].nunique()}")
-        print(f"🗺️ Total states: {df['state'].nunique()}")
+        print(f"📍 Total stations: {unique_counts['station_name']}")
+        print(f"🏙️ Total cities: {unique_counts['city']}")
+        print(f"🗺️ Total states: {unique_counts['state']}")
+        
+        # One grouped count over the categoricals; each breakdown is a sum over it. Groups
+        # keep first-appearance order so the stable sort breaks ties as value_counts does
+        counts = df.groupby(['parameter', 'season', 'city'], observed=True, sort=False).size()
+        
+        def level_counts(level):
+            return counts.groupby(level=level, observed=True, sort=False).sum().sort_values(ascending=False, kind='stable')
         
         # Parameter breakdown
-        param_counts = df['parameter'].value_counts()
         print(f"\n🔬 Parameter breakdown:")
-        for param, count in param_counts.items():
+        for param, count in level_counts('parameter').items():
             print(f"   {param}: {count:,} records")
         
         # Date range
@@ -449,30 +485,30 @@ class IndiaAirQualityFetcher:
         
         # Seasonal distribution
         print(f"\n🌡️ Seasonal distribution:")
-        seasonal_counts = df['season'].value_counts()
-        for season, count in seasonal_counts.items():
+        for season, count in level_counts('season').items():
             print(f"   {season}: {count:,} records")
         
         # City-wise data availability
         print(f"\n🏆 Top 10 cities by data availability:")
-        city_counts = df['city'].value_counts().head(10)
-        for city, count in city_counts.items():
+        for city, count in level_counts('city').head(10).items():
             print(f"   {city}: {count:,} records")
         
         # Pollution level statistics
         print(f"\n🌫️ Pollution level statistics:")
+        df_values = df.assign(value=exact_values(df['value']))
+        param_stats = df_values.groupby('parameter', observed=True)['value'].agg(['mean', 'median', 'min', 'max', 'std'])
         for param in ['PM2.5', 'PM10']:
-            param_data = df[df['parameter'] == param]['value']
+            stats = param_stats.loc[param]
             print(f"   {param}:")
-            print(f"     Mean: {param_data.mean():.1f} µg/m³")
-            print(f"     Median: {param_data.median():.1f} µg/m³")
-            print(f"     Min: {param_data.min():.1f} µg/m³")
-            print(f"     Max: {param_data.max():.1f} µg/m³")
-            print(f"     Std: {param_data.std():.1f} µg/m³")
+            print(f"     Mean: {stats['mean']:.1f} µg/m³")
+            print(f"     Median: {stats['median']:.1f} µg/m³")
+            print(f"     Min: {stats['min']:.1f} µg/m³")
+            print(f"     Max: {stats['max']:.1f} µg/m³")
+            print(f"     Std: {stats['std']:.1f} µg/m³")
         
         # Regional statistics
         print(f"\n🗺️ Regional average pollution levels:")
-        regional_stats = df.groupby(['region', 'parameter'])['value'].mean().round(1)
+        regional_stats = df_values.groupby(['region', 'parameter'])['value'].mean().round(1)
         print(regional_stats.to_string())
         
         return df
@@ -539,7 +575,8 @@ def main():
     print("   ⏳ Random Forest ML model training (next step)")
     
     print(f"\n📈 Sample data preview:")
-    print(df.head(10)[['datetime', 'station_name', 'city', 'parameter', 'value', 'season', 'region']].to_string(index=False))
+    preview = df.head(10)[['datetime', 'station_name', 'city', 'parameter', 'value', 'season', 'region']]
+    print(preview.assign(value=exact_values(preview['value'])).to_string(index=False))
     
     return df
 
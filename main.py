@@ -1,59 +1,287 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import gzip
+import hashlib
+import importlib.util
+import math
+import os
+import sys
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlencode
 
-def fetch_parameter(param):
+try:
+    # orjson parses the raw response bytes several times faster than stdlib json
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        # pandas bundles ujson, still quicker than stdlib json and no extra install
+        from pandas.io.json import ujson_loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; pages are kept in memory without it
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; pandas is used when it is missing
+    pl = None
+
+# Upper bound on pages in flight per parameter; the worker pool replaces the
+# old fixed sleep between pages as the way of going easy on the API
+MAX_CONCURRENT_REQUESTS = 5
+
+# Parameters fetched side by side by main()
+PARAMETERS = ["pm25", "pm10"]
+
+# Shared keep-alive session: every page reuses a pooled TLS connection
+# instead of a fresh handshake, and throttled/failed calls are retried
+SESSION = requests.Session()
+SESSION.headers.update({
+    # urllib3 can only decode brotli bodies when a brotli package is installed
+    "Accept-Encoding": "gzip, deflate, br" if (importlib.util.find_spec("brotli")
+                                              or importlib.util.find_spec("brotlicffi")) else "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "india-pm/1.0"
+})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=MAX_CONCURRENT_REQUESTS * len(PARAMETERS),
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=True, raise_on_status=False)
+))
+
+# Pages are stored with their ETag so a re-run can send If-None-Match and
+# reuse the stored body when the API answers 304 Not Modified. The entries
+# get their own subdirectory: fetch_openaq_alternative.py keeps TTL entries
+# of the same URLs, under the same key scheme, in .openaq_cache itself
+ETAG_CACHE_DIR = Path(".openaq_cache") / "etag"
+
+# Only pause when the API says the quota is nearly used up
+RATE_LIMIT_MIN_REMAINING = 5
+MAX_RATE_LIMIT_WAIT = 60
+
+# v3 measurement fields (flattened with "_") and the output columns they fill
+V3_COLUMNS = {
+    "datetime": "date",
+    "location": "location",
+    "city": "city",
+    "value": "value",
+    "unit": "unit",
+    "coordinates_latitude": "latitude",
+    "coordinates_longitude": "longitude"
+}
+V3_TEXT_COLUMNS = ["location", "city", "unit"]
+V3_NUMERIC_COLUMNS = ["value", "latitude", "longitude"]
+
+class PageSpool:
+    """
+    Collect page frames as row groups of a temporary Parquet file when pyarrow
+    is available, so fetched pages are not all held in memory until the end
+    """
+    
+    def __init__(self, name):
+        self.frames = []
+        self.writer = None
+        if pa is not None:
+            self.spool_dir = tempfile.TemporaryDirectory()
+            self.path = os.path.join(self.spool_dir.name, f"{name}.parquet")
+    
+    def append(self, page_df):
+        """Add one page; every page after the first must match its columns"""
+        if pa is None:
+            self.frames.append(page_df)
+            return
+        
+        table = pa.Table.from_pandas(page_df, schema=self.writer.schema if self.writer else None,
+                                     preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self.writer.write_table(table)
+    
+    def to_frame(self):
+        """Return all pages as one frame and remove the spool file"""
+        if self.writer is None:
+            return pd.concat(self.frames, ignore_index=True) if self.frames else pd.DataFrame()
+        
+        self.writer.close()
+        df = pq.read_table(self.path).to_pandas()
+        self.spool_dir.cleanup()
+        return df
+
+# Shared read-only default for missing nested objects
+_EMPTY = {}
+
+# Repetitive label columns, stored as categoricals once the pages are combined
+CATEGORY_COLUMNS = ["parameter", "unit", "country", "city", "location"]
+
+# Columns identifying one reading; v3 records often lack a location name, so
+# coordinates keep same-hour readings of different stations apart
+READING_KEY = ["location", "latitude", "longitude", "date", "parameter"]
+
+def header_seconds(headers, name, default=1.0):
+    """Read a wait time in seconds from a response header, capped at MAX_RATE_LIMIT_WAIT"""
+    try:
+        return min(max(float(headers.get(name, default)), 0.0), MAX_RATE_LIMIT_WAIT)
+    except ValueError:
+        return default
+
+def etag_cache_paths(url, params):
+    """(body_path, etag_path) cache files of one request"""
+    key = hashlib.blake2b(f"{url}?{urlencode(sorted(params.items()))}".encode(), digest_size=16).hexdigest()
+    return ETAG_CACHE_DIR / f"{key}.json.gz", ETAG_CACHE_DIR / f"{key}.etag"
+
+def fetch_page(session, url, params):
+    """Fetch one page and return its raw JSON body"""
+    body_path, etag_path = etag_cache_paths(url, params)
+    try:
+        headers = {"If-None-Match": etag_path.read_text()} if body_path.exists() else {}
+    except OSError:
+        headers = {}
+    
+    resp = session.get(url, params=params, headers=headers, timeout=30)
+    body = None
+    if resp.status_code == 304:
+        try:
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, EOFError):
+            # Stored body is gone or damaged: ask again without the ETag
+            resp = session.get(url, params=params, timeout=30)
+    resp.raise_for_status()
+    
+    if body is None:
+        body = resp.content
+        etag = resp.headers.get("ETag")
+        if etag:
+            # Write then rename so concurrent readers never see a partial file
+            ETAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            body_path.with_suffix(suffix).write_bytes(gzip.compress(body, compresslevel=1))
+            os.replace(body_path.with_suffix(suffix), body_path)
+            etag_path.with_suffix(suffix).write_text(etag)
+            os.replace(etag_path.with_suffix(suffix), etag_path)
+    
+    # 429s are retried by the session after their Retry-After; otherwise wait
+    # out the window only when the remaining quota runs low
+    remaining = resp.headers.get("x-ratelimit-remaining", "")
+    if remaining.isdigit() and int(remaining) <= RATE_LIMIT_MIN_REMAINING:
+        time.sleep(header_seconds(resp.headers, "x-ratelimit-reset"))
+    
+    return body
+
+def parse_page(body, param):
+    """
+    Decode one raw v3 page and flatten its records
+    
+    Returns:
+        (found, page_df) tuple: the page's meta.found count, and its frame or
+        None when the page has no results
+    """
+    try:
+        data = json_loads(body)
+    except ValueError as e:
+        # Keep malformed bodies a RequestException, as resp.json() raised them
+        raise requests.exceptions.InvalidJSONError(str(e)) from e
+    
+    found = (data.get("meta") or {}).get("found")
+    if not data.get("results"):
+        return found, None
+    return found, measurements_frame(data["results"], param)
+
+def fetch_measurements(session, url, params, param):
+    """Fetch one v3 page and parse it in the fetching thread"""
+    return parse_page(fetch_page(session, url, params), param)
+
+def iter_pages(session, url, params, param):
+    """
+    Yield (page, future) in page order while keeping up to
+    MAX_CONCURRENT_REQUESTS page requests in flight; each future resolves to
+    the parse_page result of its page
+    
+    Page 1 is fetched on its own first; the meta.found count it reports caps
+    how many pages are requested. Pages still pending when the caller stops
+    iterating are cancelled.
+    """
+    fetch = partial(fetch_measurements, session, url, param=param)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        probe = pool.submit(fetch, {**params, "page": 1})
+        yield 1, probe
+        
+        found, _ = probe.result()
+        last_page = math.ceil(found / params["limit"]) if isinstance(found, int) else None
+        
+        pending = deque()
+        next_page = 2
+        try:
+            while True:
+                while len(pending) < MAX_CONCURRENT_REQUESTS and (last_page is None or next_page <= last_page):
+                    pending.append((next_page, pool.submit(fetch, {**params, "page": next_page})))
+                    next_page += 1
+                if not pending:
+                    return
+                yield pending.popleft()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+def measurements_frame(results, param):
+    """Flatten one page of v3 measurement records into the output columns"""
+    page_df = pd.json_normalize(results, sep="_").reindex(columns=list(V3_COLUMNS)).rename(columns=V3_COLUMNS)
+    
+    # Missing text and numbers stay missing (blank in the CSV as before), so a null location or
+    # city is not counted as a value of its own. Fixed dtypes keep every page on the spool
+    # schema taken from the first one, even when a page holds only whole-number values or coordinates
+    page_df[V3_TEXT_COLUMNS] = page_df[V3_TEXT_COLUMNS].astype("string")
+    page_df[V3_NUMERIC_COLUMNS] = page_df[V3_NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce").astype("float64")
+    
+    # Parse while the page is small; a page shares few distinct hours, so the cache mostly hits
+    page_df["date"] = pd.to_datetime(page_df["date"], format="ISO8601", utc=True, errors="coerce", cache=True)
+    page_df.insert(3, "parameter", param)
+    page_df["country"] = "India"
+    return page_df
+
+def fetch_parameter(param, session=SESSION):
     print(f"Fetching {param} data for India...")
-    rows = []
-    page = 1
+    pages = PageSpool(param)
     limit = 1000  # API limit
     total_fetched = 0
     
-    while True:
-        # Using OpenAQ API v3 (newer version)
-        url = "https://api.openaq.org/v3/measurements"
-        params = {
-            "countries_id": "91",  # India's country ID
-            "parameters_id": "2" if param == "pm25" else "1",  # PM2.5=2, PM10=1
-            "limit": limit,
-            "page": page,
-            "sort": "datetime",
-            "order": "desc"
-        }
-        
+    # Using OpenAQ API v3 (newer version)
+    url = "https://api.openaq.org/v3/measurements"
+    params = {
+        "countries_id": "91",  # India's country ID
+        "parameters_id": "2" if param == "pm25" else "1",  # PM2.5=2, PM10=1
+        "limit": limit,
+        "sort": "datetime",
+        "order": "desc"
+    }
+    
+    for page, future in iter_pages(session, url, params, param):
         try:
             print(f"  Fetching page {page}...")
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            
-            data = resp.json()
+            _, page_df = future.result()
             
             # Check if we have results
-            if "results" not in data or not data["results"]:
+            if page_df is None:
                 print(f"  No more results found on page {page}")
                 break
             
-            # Process each record
-            for rec in data["results"]:
-                try:
-                    row = {
-                        "date": rec.get("datetime", ""),
-                        "location": rec.get("location", ""),
-                        "city": rec.get("city", ""),
-                        "parameter": param,
-                        "value": rec.get("value", ""),
-                        "unit": rec.get("unit", ""),
-                        "latitude": rec.get("coordinates", {}).get("latitude", "") if rec.get("coordinates") else "",
-                        "longitude": rec.get("coordinates", {}).get("longitude", "") if rec.get("coordinates") else "",
-                        "country": "India"
-                    }
-                    rows.append(row)
-                except Exception as e:
-                    print(f"    Error processing record: {e}")
-                    continue
+            # The page arrives already decoded and flattened
+            pages.append(page_df)
             
-            current_batch = len(data["results"])
+            current_batch = len(page_df)
             total_fetched += current_batch
             print(f"  Page {page}: {current_batch} records (Total: {total_fetched})")
             
@@ -61,30 +289,27 @@ def fetch_parameter(param):
             if current_batch < limit:
                 print(f"  Reached end of data for {param}")
                 break
-                
-            page += 1
-            
-            # Add delay to be respectful to the API
-            time.sleep(0.5)
             
         except requests.exceptions.RequestException as e:
             print(f"  API request error on page {page}: {e}")
             # Try alternative approach with v2 API if v3 fails
             if page == 1:
                 print(f"  Trying alternative approach for {param}...")
-                return fetch_parameter_v2(param)
+                return fetch_parameter_v2(param, session)
             break
         except Exception as e:
             print(f"  Unexpected error on page {page}: {e}")
             break
     
     print(f"✅ Total {param} records fetched: {total_fetched}")
-    return pd.DataFrame(rows)
+    return pages.to_frame()
 
-def fetch_parameter_v2(param):
+def fetch_parameter_v2(param, session=SESSION):
     """Fallback to v2 API with different approach"""
     print(f"Using alternative method for {param}...")
-    rows = []
+    
+    # One list per column, filled in step and handed to pandas without transposing
+    dates, locations, cities, parameters, values, units, latitudes, longitudes = ([] for _ in range(8))
     
     # Try different API endpoints
     urls_to_try = [
@@ -102,113 +327,184 @@ def fetch_parameter_v2(param):
                 "format": "json"
             }
             
-            resp = requests.get(base_url, params=params, timeout=30)
+            resp = session.get(base_url, params=params, timeout=30)
             if resp.status_code == 200:
-                data = resp.json()
+                data = json_loads(resp.content)
                 if "results" in data and data["results"]:
                     for rec in data["results"]:
                         try:
-                            row = {
-                                "date": rec.get("date", {}).get("utc", ""),
-                                "location": rec.get("location", ""),
-                                "city": rec.get("city", ""),
-                                "parameter": rec.get("parameter", ""),
-                                "value": rec.get("value", ""),
-                                "unit": rec.get("unit", ""),
-                                "latitude": rec.get("coordinates", {}).get("latitude", ""),
-                                "longitude": rec.get("coordinates", {}).get("longitude", ""),
-                                "country": "India"
-                            }
-                            rows.append(row)
+                            # One lookup per nested object; a missing or null one reads as empty.
+                            # A bad record fails here, before any column has been appended to
+                            coords = rec.get("coordinates") or _EMPTY
+                            date = (rec.get("date") or _EMPTY).get("utc", "")
+                            latitude = coords.get("latitude", "")
+                            longitude = coords.get("longitude", "")
                         except:
                             continue
-                    print(f"✅ Fetched {len(rows)} records using alternative method")
-                    return pd.DataFrame(rows)
+                        dates.append(date)
+                        locations.append(rec.get("location", ""))
+                        cities.append(rec.get("city", ""))
+                        parameters.append(rec.get("parameter", ""))
+                        values.append(rec.get("value", ""))
+                        units.append(rec.get("unit", ""))
+                        latitudes.append(latitude)
+                        longitudes.append(longitude)
+                    print(f"✅ Fetched {len(dates)} records using alternative method")
+                    # Typed like the v3 pages: UTC timestamps and floats, blanks as NaT/NaN
+                    return pd.DataFrame({
+                        "date": pd.to_datetime(dates, format="ISO8601", utc=True, errors="coerce", cache=True),
+                        "location": locations,
+                        "city": cities,
+                        "parameter": parameters,
+                        "value": pd.to_numeric(values, errors="coerce"),
+                        "unit": units,
+                        "latitude": pd.to_numeric(latitudes, errors="coerce"),
+                        "longitude": pd.to_numeric(longitudes, errors="coerce"),
+                        "country": "India"
+                    })
         except:
             continue
     
     print(f"❌ Could not fetch {param} data from any API endpoint")
-    return pd.DataFrame(rows)
-
+    return pd.DataFrame()
 
-def main():
-    """Main function to fetch and combine PM2.5 and PM10 data for India"""
-    print("🇮🇳 Fetching air quality data for India...")
-    print("=" * 50)
+def combine_with_polars(frames):
+    """
+    Concatenate, deduplicate and date-sort the fetched frames as one lazy,
+    multithreaded Polars query; the result comes back as a pandas frame
     
-    # Fetch PM2.5 data
-    print("\n📊 Step 1: Fetching PM2.5 data...")
-    df_pm25 = fetch_parameter("pm25")
-    
-    # Fetch PM10 data
-    print("\n📊 Step 2: Fetching PM10 data...")
-    df_pm10 = fetch_parameter("pm10")
+    Args:
+        frames: Fetched frames with typed date and numeric columns
+    """
+    combined = (
+        pl.concat([pl.from_pandas(frame) for frame in frames], how="vertical_relaxed")
+        .lazy()
+        .unique(subset=READING_KEY, keep="first", maintain_order=True)
+        .sort("date", descending=True, nulls_last=True, maintain_order=True)
+        .collect()
+    )
+    return combined.to_pandas()
+
+
+def main(csv=False):
+    """
+    Main function to fetch and combine PM2.5 and PM10 data for India
     
-    # Check if we have any data
-    if len(df_pm25) == 0 and len(df_pm10) == 0:
-        print("\n❌ No data fetched. The OpenAQ API might be down or changed.")
-        print("🔄 Trying to create sample data to demonstrate the structure...")
+    Args:
+        csv: Also write the legacy CSV file; it is always written when pyarrow
+            is not installed
+    """
+    try:
+        print("🇮🇳 Fetching air quality data for India...")
+        print("=" * 50)
         
-        # Create sample data structure
-        sample_data = {
-            "date": ["2024-01-01T12:00:00Z", "2024-01-01T13:00:00Z"],
-            "location": ["Sample Location 1", "Sample Location 2"],
-            "city": ["Mumbai", "Delhi"],
-            "parameter": ["pm25", "pm10"],
-            "value": [45.5, 78.2],
-            "unit": ["µg/m³", "µg/m³"],
-            "latitude": [19.0760, 28.7041],
-            "longitude": [72.8777, 77.1025],
-            "country": ["India", "India"]
-        }
-        df_combined = pd.DataFrame(sample_data)
-        print("📋 Created sample data structure")
+        # Fetch PM2.5 and PM10 data at the same time; both are waiting on the network
+        print("\n📊 Step 1: Fetching PM2.5 and PM10 data...")
+        with ThreadPoolExecutor(max_workers=len(PARAMETERS)) as pool:
+            df_pm25, df_pm10 = pool.map(fetch_parameter, PARAMETERS)
         
-    else:
-        # Combine datasets
-        print("\n🔄 Step 3: Combining datasets...")
-        df_combined = pd.concat([df_pm25, df_pm10], ignore_index=True)
+        # Check if we have any data
+        if len(df_pm25) == 0 and len(df_pm10) == 0:
+            print("\n❌ No data fetched. The OpenAQ API might be down or changed.")
+            print("🔄 Trying to create sample data to demonstrate the structure...")
+            
+            # Create sample data structure
+            sample_data = {
+                "date": ["2024-01-01T12:00:00Z", "2024-01-01T13:00:00Z"],
+                "location": ["Sample Location 1", "Sample Location 2"],
+                "city": ["Mumbai", "Delhi"],
+                "parameter": ["pm25", "pm10"],
+                "value": [45.5, 78.2],
+                "unit": ["µg/m³", "µg/m³"],
+                "latitude": [19.0760, 28.7041],
+                "longitude": [72.8777, 77.1025],
+                "country": ["India", "India"]
+            }
+            df_combined = pd.DataFrame(sample_data)
+            print("📋 Created sample data structure")
         
-        # Remove duplicates if any
-        initial_count = len(df_combined)
-        df_combined = df_combined.drop_duplicates()
-        final_count = len(df_combined)
+        else:
+            # Combine datasets
+            print("\n🔄 Step 2: Combining datasets...")
+            # concat copies every block, so a parameter that came back empty is left out
+            # rather than merged in; a single frame is used as is
+            frames = [frame for frame in (df_pm25, df_pm10) if len(frame) > 0]
+            initial_count = sum(len(frame) for frame in frames)
+            
+            if pl is not None:
+                # Merge, remove duplicates and sort newest first in one Polars query
+                df_combined = combine_with_polars(frames)
+            else:
+                df_combined = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            
+            # Repeated labels become categoricals: integer codes for masks, groupings and
+            # the duplicate check below, one copy of each string
+            df_combined = df_combined.astype(dict.fromkeys(CATEGORY_COLUMNS, "category"))
+            
+            # Remove duplicates if any, comparing the reading key rather than every column
+            if pl is None:
+                df_combined = df_combined.drop_duplicates(subset=READING_KEY, keep="first")
+            final_count = len(df_combined)
+            
+            if initial_count != final_count:
+                print(f"   Removed {initial_count - final_count} duplicate records")
         
-        if initial_count != final_count:
-            print(f"   Removed {initial_count - final_count} duplicate records")
-    
-    # Convert date column if it exists and has data
-    if 'date' in df_combined.columns and len(df_combined) > 0:
-        try:
-            df_combined['date'] = pd.to_datetime(df_combined['date'])
-            df_combined = df_combined.sort_values('date', ascending=False)
-        except Exception as e:
-            print(f"   Note: Could not parse dates: {e}")
-    
-    # Save to CSV
-    filename = f"india_air_quality_pm25_pm10_{datetime.now().strftime('%Y%m%d')}.csv"
-    df_combined.to_csv(filename, index=False)
-    
-    print(f"\n✅ Data saved successfully!")
-    print(f"📁 Filename: {filename}")
-    print(f"📊 Total records: {len(df_combined)}")
-    
-    if len(df_combined) > 0:
-        print(f"📈 PM2.5 records: {len(df_combined[df_combined['parameter'] == 'pm25'])}")
-        print(f"📈 PM10 records: {len(df_combined[df_combined['parameter'] == 'pm10'])}")
+        # Convert date column if it exists and has data
+        if 'date' in df_combined.columns and len(df_combined) > 0:
+            try:
+                # Explicit ISO-8601 keeps pandas on its vectorized parser; bad stamps become NaT
+                df_combined['date'] = pd.to_datetime(df_combined['date'], format="ISO8601", utc=True,
+                                                     errors="coerce", cache=True)
+                unparsed = int(df_combined['date'].isna().sum())
+                if unparsed:
+                    print(f"   ⚠️ Dropping {unparsed} records with unparseable dates")
+                    df_combined = df_combined.dropna(subset=['date'])
+                # The API returns each parameter newest first and the Polars query sorts, so
+                # this only runs on the two concatenated runs of the pandas path; the stable
+                # sort (timsort) merges such runs in near-linear time and keeps same-hour
+                # readings in their fetched order, as in the Polars query
+                if not df_combined['date'].is_monotonic_decreasing:
+                    df_combined = df_combined.sort_values('date', ascending=False, kind="mergesort")
+            except Exception as e:
+                print(f"   Note: Could not parse dates: {e}")
         
-        # Show some statistics
-        print(f"\n📋 Data Summary:")
-        if 'date' in df_combined.columns:
-            print(f"   Date range: {df_combined['date'].min()} to {df_combined['date'].max()}")
-        print(f"   Unique locations: {df_combined['location'].nunique()}")
-        print(f"   Unique cities: {df_combined['city'].nunique()}")
+        # Save as compressed Parquet, which keeps the dtypes; CSV only when asked for
+        filename = f"india_air_quality_pm25_pm10_{datetime.now().strftime('%Y%m%d')}.csv"
+        saved_files = []
+        if pa is not None:
+            parquet_filename = filename.replace('.csv', '.parquet')
+            df_combined.to_parquet(parquet_filename, engine='pyarrow', compression='zstd', index=False)
+            saved_files.append(parquet_filename)
+        if csv or pa is None:
+            df_combined.to_csv(filename, index=False)
+            saved_files.append(filename)
         
-        # Show sample of data
-        print(f"\n📊 Sample data:")
-        print(df_combined.head())
-    
-    return df_combined
+        print(f"\n✅ Data saved successfully!")
+        for saved_file in saved_files:
+            print(f"📁 Filename: {saved_file}")
+        print(f"📊 Total records: {len(df_combined)}")
+        
+        if len(df_combined) > 0:
+            # One counting pass instead of a filtered copy of the frame per parameter
+            parameter_counts = df_combined['parameter'].value_counts()
+            print(f"📈 PM2.5 records: {parameter_counts.get('pm25', 0)}")
+            print(f"📈 PM10 records: {parameter_counts.get('pm10', 0)}")
+            
+            # Show some statistics
+            print(f"\n📋 Data Summary:")
+            if 'date' in df_combined.columns:
+                print(f"   Date range: {df_combined['date'].min()} to {df_combined['date'].max()}")
+            unique_counts = df_combined[['location', 'city']].nunique()
+            print(f"   Unique locations: {unique_counts['location']}")
+            print(f"   Unique cities: {unique_counts['city']}")
+            
+            # Show sample of data
+            print(f"\n📊 Sample data:")
+            print(df_combined.head())
+        
+        return df_combined
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
-    df = main()
+    df = main(csv="--csv" in sys.argv[1:])
@@ -0,0 +1,56 @@
+"""Tests for the v3 measurement parsing in fetch_openaq_alternative"""
+
+import threading
+import unittest
+
+import fetch_openaq_alternative as alt
+
+def measurements_body(stamp, value):
+    """A v3 measurements body with one PM2.5 record, datetime nested as in the API"""
+    return (
+        '{"meta": {"found": 1}, "results": [{'
+        f'"datetime": {{"utc": "{stamp}", "local": "{stamp[:-1]}+05:30"}}, '
+        f'"value": {value}, "unit": "µg/m³", '
+        '"parameter": {"id": 2, "name": "pm25"}, '
+        '"coverage": {"expectedCount": 1, "observedCount": 1}'
+        '}]}'
+    ).encode()
+
+class ParseMeasurementsTest(unittest.TestCase):
+
+    def test_back_to_back_bodies_on_one_thread(self):
+        # The first call's records are still alive while the second body is parsed
+        first = alt.parse_measurements(measurements_body("2024-07-03T12:00:00Z", 41.5))
+        second = alt.parse_measurements(measurements_body("2024-07-03T13:00:00Z", 43))
+
+        self.assertEqual(first[0]["datetime"], {"utc": "2024-07-03T12:00:00Z", "local": "2024-07-03T12:00:00+05:30"})
+        self.assertEqual(second[0]["datetime"]["utc"], "2024-07-03T13:00:00Z")
+        self.assertEqual((second[0]["value"], second[0]["unit"]), (43, "µg/m³"))
+        for record in first + second:
+            self.assertIs(type(record["datetime"]), dict)
+            # Records are staged as NDJSON, so they must serialize
+            alt.json_dumps(record)
+
+    def test_parses_in_worker_threads(self):
+        errors = []
+
+        def parse_twice():
+            try:
+                for hour in ("12", "13"):
+                    alt.parse_measurements(measurements_body(f"2024-07-03T{hour}:00:00Z", 41.5))
+            except Exception as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=parse_twice) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+
+    def test_utc_stamp(self):
+        self.assertEqual(alt.utc_stamp({"utc": "2024-07-03T12:00:00Z", "local": "x"}), "2024-07-03T12:00:00Z")
+        self.assertEqual(alt.utc_stamp("2024-07-03T12:00:00Z"), "2024-07-03T12:00:00Z")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Tests for the v3 page handling in main"""
+
+import unittest
+
+import main
+
+def page_records(values, coordinates):
+    """v3 measurement records with the given values and (latitude, longitude) pairs"""
+    return [
+        {"datetime": f"2024-07-03T{hour:02d}:00:00Z", "location": "Anand Vihar", "city": "Delhi",
+         "value": value, "unit": "µg/m³", "coordinates": {"latitude": latitude, "longitude": longitude}}
+        for hour, (value, (latitude, longitude)) in enumerate(zip(values, coordinates))
+    ]
+
+class PageSpoolTest(unittest.TestCase):
+
+    def test_integer_page_then_float_page(self):
+        # Page 1 holds only whole numbers, so inferred on its own it would be int64
+        spool = main.PageSpool("pm25")
+        spool.append(main.measurements_frame(page_records([41, 43], [(28, 77), (19, 72)]), "pm25"))
+        spool.append(main.measurements_frame(page_records([41.5, "n/a"], [(28.6469, 77.3152), (None, None)]), "pm25"))
+        df = spool.to_frame()
+
+        self.assertEqual(len(df), 4)
+        for column in main.V3_NUMERIC_COLUMNS:
+            self.assertEqual(df[column].dtype, "float64")
+        self.assertEqual(df["value"].tolist()[:3], [41.0, 43.0, 41.5])
+        self.assertTrue(df["value"].isna().iloc[3])
+        self.assertEqual(df["latitude"].iloc[2], 28.6469)
+
+class MeasurementsFrameTest(unittest.TestCase):
+
+    def test_null_labels_stay_missing(self):
+        records = page_records([41, 43], [(28, 77), (19, 72)])
+        records[1]["location"] = records[1]["city"] = None
+        page_df = main.measurements_frame(records, "pm25")
+
+        self.assertTrue(page_df.loc[1, ["location", "city"]].isna().all())
+        self.assertEqual(page_df[["location", "city"]].nunique().tolist(), [1, 1])
+
+if __name__ == "__main__":
+    unittest.main()